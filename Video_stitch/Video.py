@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
 import logging
+import threading
+from queue import Empty, Full, Queue
 from typing import List, Tuple, Optional
 from datetime import datetime
 
@@ -11,9 +13,24 @@ class VideoStitcher:
         self.OUTPUT_FPS = 30  # Standard output FPS
         self.DEFAULT_WIDTH = 1920  # Default output width
         self.DEFAULT_HEIGHT = 1080  # Default output height
+        self.PIPELINE_DEPTH = 8  # Max frames buffered between pipeline stages
         self.user_login = user_login
         self.timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
 
+        # The watermark text only depends on state fixed here, so the
+        # tile and its geometry are rendered once up front
+        self._wm_premult = None
+        self._wm_inv_alpha = None
+        self._wm_margin = 20
+        self._build_watermark_tile()
+
+
+        # Persistent letterbox canvas reused by resize_frame, plus the
+        # letterbox geometry cached per input frame size
+        self._canvas = None
+        self._canvas_content = (0, 0)
+        self._resize_plans = {}
+
     def process_videos(  # Changed method name from stitch_videos to process_videos
         self,
         video_paths: List[str],
@@ -21,7 +38,13 @@ class VideoStitcher:
         target_width: Optional[int] = None,
         target_height: Optional[int] = None,
     ) -> Tuple[bool, str]:
-        """Stitch multiple videos together with fade transitions and Mansio watermark"""
+        """Stitch multiple videos together with fade transitions and Mansio watermark.
+
+        The work is pipelined across three stages - decode, process
+        (resize/transition/watermark) and encode - connected by bounded
+        queues, so throughput tracks the slowest stage instead of the sum
+        of all three.
+        """
         try:
             if not video_paths:
                 return False, "No video paths provided"
@@ -29,14 +52,80 @@ class VideoStitcher:
             target_width = target_width or self.DEFAULT_WIDTH
             target_height = target_height or self.DEFAULT_HEIGHT
 
-            fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-            out = cv2.VideoWriter(
-                output_path, fourcc, self.OUTPUT_FPS, (target_width, target_height)
+            out = self._open_writer(output_path, target_width, target_height)
+
+            decode_q = Queue(maxsize=self.PIPELINE_DEPTH)
+            encode_q = Queue(maxsize=self.PIPELINE_DEPTH)
+            self._pipeline_error = None
+            self._pipeline_stop = threading.Event()
+
+            decoder = threading.Thread(
+                target=self._decode_worker, args=(video_paths, decode_q), daemon=True
+            )
+            processor = threading.Thread(
+                target=self._process_worker,
+                args=(decode_q, encode_q, len(video_paths), target_width, target_height),
+                daemon=True,
             )
+            decoder.start()
+            processor.start()
 
-            last_frame = None
-            total_videos = len(video_paths)
+            # The encode stage runs here: OpenCV releases the GIL inside
+            # decode/resize/write, so the three stages genuinely overlap
+            try:
+                while True:
+                    frame = self._pipeline_get(encode_q)
+                    if frame is None:
+                        break
+                    out.write(frame)
+            finally:
+                # The stop flag unblocks any stage still waiting on a
+                # bounded queue, so these joins cannot deadlock after a
+                # failure in either worker or in the encode loop above
+                self._pipeline_stop.set()
+                decoder.join()
+                processor.join()
+
+            if self._pipeline_error is not None:
+                return False, str(self._pipeline_error)
+
+            return True, "Videos stitched successfully with Mansio watermark"
+
+        except Exception as e:
+            self.logger.error(f"Error stitching videos: {str(e)}")
+            return False, str(e)
+        finally:
+            if "out" in locals():
+                out.release()
+
+    def _pipeline_put(self, q: Queue, item) -> bool:
+        """Put onto a pipeline queue unless the pipeline has stopped.
+
+        Bounded puts poll with a timeout so a stage blocked on a full
+        queue notices a failure elsewhere instead of deadlocking on it.
+        Returns False once the stop flag is set.
+        """
+        while not self._pipeline_stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
 
+    def _pipeline_get(self, q: Queue):
+        """Get from a pipeline queue, returning None once the pipeline stops."""
+        while not self._pipeline_stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except Empty:
+                continue
+        return None
+
+    def _decode_worker(self, video_paths: List[str], decode_q: Queue) -> None:
+        """Decode stage: push raw frames and clip boundaries onto the queue."""
+        try:
+            total_videos = len(video_paths)
             for video_index, video_path in enumerate(video_paths):
                 self.logger.info(
                     f"Processing video {video_index + 1}/{total_videos}: {video_path}"
@@ -47,103 +136,199 @@ class VideoStitcher:
                     self.logger.error(f"Could not open video: {video_path}")
                     continue
 
-                frame_count = 0
                 total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
-                while True:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
+                try:
+                    while True:
+                        ret, frame = cap.read()
+                        if not ret:
+                            break
+                        if not self._pipeline_put(
+                            decode_q, (video_index, total_frames, frame)
+                        ):
+                            return  # downstream stage failed
+                finally:
+                    cap.release()
 
-                    resized_frame = self.resize_frame(frame, target_width, target_height)
+                # clip boundary
+                if not self._pipeline_put(decode_q, (video_index, total_frames, None)):
+                    return
+        except Exception as e:
+            self.logger.error(f"Error decoding videos: {str(e)}")
+            self._pipeline_error = e
+            self._pipeline_stop.set()
+        finally:
+            self._pipeline_put(decode_q, None)  # end of stream
 
-                    if last_frame is not None and frame_count == 0:
-                        transition_frames = self.create_fade_transition(
-                            last_frame, resized_frame, self.TRANSITION_FRAMES
-                        )
-                        for trans_frame in transition_frames:
-                            watermarked_trans = self.add_mansio_watermark(trans_frame)
-                            out.write(watermarked_trans)
+    def _process_worker(
+        self,
+        decode_q: Queue,
+        encode_q: Queue,
+        total_videos: int,
+        target_width: int,
+        target_height: int,
+    ) -> None:
+        """Process stage: resize, fade and watermark frames for the encoder."""
+        try:
+            last_frame = None
+            resized_frame = None
+            frame_count = 0
 
-                    watermarked_frame = self.add_mansio_watermark(resized_frame)
-                    out.write(watermarked_frame)
-                    last_frame = resized_frame.copy()
-                    frame_count += 1
+            while True:
+                item = self._pipeline_get(decode_q)
+                if item is None:
+                    break
 
-                    if frame_count % 30 == 0:
-                        progress = (frame_count / total_frames) * 100
-                        print(
-                            f"Video {video_index + 1}/{total_videos}: {progress:.1f}% complete"
-                        )
+                video_index, total_frames, frame = item
+                if frame is None:
+                    # Only the final frame of a clip seeds the next
+                    # transition, so one copy per clip replaces one per frame
+                    if frame_count > 0:
+                        last_frame = resized_frame.copy()
+                    frame_count = 0
+                    continue
 
-                cap.release()
+                resized_frame = self.resize_frame(frame, target_width, target_height)
 
-            out.release()
-            return True, "Videos stitched successfully with Mansio watermark"
+                if last_frame is not None and frame_count == 0:
+                    for trans_frame in self.iter_fade_transition(last_frame, resized_frame):
+                        if not self._pipeline_put(encode_q, trans_frame):
+                            return  # encode stage failed
 
+                # The canvas is reused by the next resize, so the encode
+                # stage gets its own copy to watermark in place
+                if not self._pipeline_put(
+                    encode_q, self.add_mansio_watermark(resized_frame.copy())
+                ):
+                    return
+                frame_count += 1
+
+                # Lazy %-formatting keeps the quiet path allocation-free
+                if total_frames > 0 and frame_count % self.OUTPUT_FPS == 0:
+                    self.logger.info(
+                        "Video %d/%d: %.1f%% complete",
+                        video_index + 1,
+                        total_videos,
+                        (frame_count / total_frames) * 100,
+                    )
         except Exception as e:
-            self.logger.error(f"Error stitching videos: {str(e)}")
-            return False, str(e)
+            self.logger.error(f"Error processing frames: {str(e)}")
+            self._pipeline_error = e
+            self._pipeline_stop.set()
         finally:
-            if "cap" in locals():
-                cap.release()
-            if "out" in locals():
-                out.release()
+            self._pipeline_put(encode_q, None)  # end of stream
+
+    def _open_writer(self, output_path: str, width: int, height: int) -> cv2.VideoWriter:
+        """Open the output writer, preferring hardware-accelerated H.264.
+
+        Newer OpenCV builds accept an FFmpeg hardware-acceleration hint; if
+        no encoder opens that way, fall back to the software mp4v writer.
+        """
+        if hasattr(cv2, "VIDEOWRITER_PROP_HW_ACCELERATION"):
+            out = cv2.VideoWriter(
+                output_path,
+                cv2.CAP_FFMPEG,
+                cv2.VideoWriter_fourcc(*"avc1"),
+                self.OUTPUT_FPS,
+                (width, height),
+                [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+            )
+            if out.isOpened():
+                return out
+
+        return cv2.VideoWriter(
+            output_path,
+            cv2.VideoWriter_fourcc(*"mp4v"),
+            self.OUTPUT_FPS,
+            (width, height),
+        )
 
     def resize_frame(self, frame: np.ndarray, target_width: int, target_height: int) -> np.ndarray:
-        """Resize frame while maintaining aspect ratio and adding black bars if needed"""
+        """Resize frame while maintaining aspect ratio and adding black bars if needed.
+
+        The letterboxed result is written directly into a persistent canvas
+        whose bars are already zero, so no border buffer is allocated. The
+        canvas is reused on the next call, so callers must consume (or copy)
+        the returned frame first.
+        """
         if frame is None:
             return None
 
-        frame_aspect = frame.shape[1] / frame.shape[0]
-        target_aspect = target_width / target_height
-
-        if frame_aspect > target_aspect:
-            new_width = target_width
-            new_height = int(target_width / frame_aspect)
-            top_padding = (target_height - new_height) // 2
-            bottom_padding = target_height - new_height - top_padding
-            left_padding = 0
-            right_padding = 0
-        else:
-            new_height = target_height
-            new_width = int(target_height * frame_aspect)
-            left_padding = (target_width - new_width) // 2
-            right_padding = target_width - new_width - left_padding
-            top_padding = 0
-            bottom_padding = 0
-
-        resized = cv2.resize(frame, (new_width, new_height))
-        padded = cv2.copyMakeBorder(
-            resized,
-            top_padding,
-            bottom_padding,
-            left_padding,
-            right_padding,
-            cv2.BORDER_CONSTANT,
-            value=[0, 0, 0],
+        frame_shape = frame.shape[:2]
+        if frame_shape == (target_height, target_width):
+            return frame  # Already at target size, nothing to do
+
+        if self._canvas is None or self._canvas.shape[:2] != (target_height, target_width):
+            self._canvas = np.zeros((target_height, target_width, 3), dtype=np.uint8)
+            self._canvas_content = (0, 0)
+            self._resize_plans.clear()
+
+        # The letterbox geometry only depends on the input size, so clips
+        # pay for the aspect arithmetic once instead of per frame
+        plan = self._resize_plans.get(frame_shape)
+        if plan is None:
+            frame_aspect = frame.shape[1] / frame.shape[0]
+            target_aspect = target_width / target_height
+
+            if frame_aspect > target_aspect:
+                new_width = target_width
+                new_height = int(target_width / frame_aspect)
+                top_padding = (target_height - new_height) // 2
+                left_padding = 0
+            else:
+                new_height = target_height
+                new_width = int(target_height * frame_aspect)
+                left_padding = (target_width - new_width) // 2
+                top_padding = 0
+
+            plan = (new_width, new_height, top_padding, left_padding)
+            self._resize_plans[frame_shape] = plan
+
+        new_width, new_height, top_padding, left_padding = plan
+
+        # Wipe stale content only when the letterboxed area moves
+        if (new_width, new_height) != self._canvas_content:
+            self._canvas[:] = 0
+            self._canvas_content = (new_width, new_height)
+
+        cv2.resize(
+            frame,
+            (new_width, new_height),
+            dst=self._canvas[
+                top_padding : top_padding + new_height,
+                left_padding : left_padding + new_width,
+            ],
         )
 
-        return padded
+        return self._canvas
 
-    def create_fade_transition(self, frame1: np.ndarray, frame2: np.ndarray, num_frames: int) -> List[np.ndarray]:
-        """Create a smooth fade transition between two frames"""
-        transition_frames = []
-        for i in range(num_frames):
-            alpha = i / num_frames
-            blended = cv2.addWeighted(frame1, 1 - alpha, frame2, alpha, 0)
-            transition_frames.append(blended)
-        return transition_frames
+    def iter_fade_transition(self, frame1: np.ndarray, frame2: np.ndarray):
+        """Yield the watermarked fade frames between two frames.
 
-    def add_mansio_watermark(self, frame: np.ndarray) -> np.ndarray:
-        """Add Mansio watermark with timestamp and user info"""
-        output = frame.copy()
-        
-        # Main watermark text
+        Both endpoints are watermarked once up front: the blend is linear,
+        so blending the watermarked endpoints is equivalent to watermarking
+        every blended frame, and the per-frame watermark pass disappears.
+        Each yielded frame is a fresh buffer because the encode stage may
+        still be holding earlier ones.
+        """
+        frame1 = self.add_mansio_watermark(frame1)
+        frame2 = self.add_mansio_watermark(frame2.copy())
+
+        for i in range(self.TRANSITION_FRAMES):
+            alpha = i / self.TRANSITION_FRAMES
+            yield cv2.addWeighted(frame1, 1 - alpha, frame2, alpha, 0)
+
+    def _build_watermark_tile(self) -> None:
+        """Pre-render the watermark tile and its alpha mask.
+
+        The three text lines only depend on instance state, so the tile is
+        rasterised once and alpha-blended into a small ROI of every frame
+        instead of re-measuring and re-drawing the text per frame.
+        """
         main_text = "Mansio"
         timestamp_text = f"UTC: {self.timestamp}"
         user_text = f"Created by: {self.user_login}"
-        
+
         font = cv2.FONT_HERSHEY_SIMPLEX
         main_font_scale = 1.5
         info_font_scale = 0.6
@@ -152,7 +337,7 @@ class VideoStitcher:
         color = (255, 255, 255)  # White
         padding = 20
         line_spacing = 5
-        
+
         # Calculate text sizes
         (main_width, main_height), _ = cv2.getTextSize(
             main_text, font, main_font_scale, main_thickness
@@ -163,45 +348,52 @@ class VideoStitcher:
         (user_width, user_height), _ = cv2.getTextSize(
             user_text, font, info_font_scale, info_thickness
         )
-        
-        # Calculate positions
+
         total_height = main_height + time_height + user_height + 2 * line_spacing
         max_width = max(main_width, time_width, user_width)
-        
-        x = frame.shape[1] - max_width - 2 * padding
-        y_bottom = frame.shape[0] - padding
-        
-        # Create semi-transparent background
-        overlay = output.copy()
-        cv2.rectangle(
-            overlay,
-            (x - padding, y_bottom - total_height - 2 * padding),
-            (x + max_width + padding, y_bottom + padding),
-            (0, 0, 0),
-            -1
-        )
-        
-        # Apply transparency
-        alpha = 0.5
-        cv2.addWeighted(overlay, alpha, output, 1 - alpha, 0, output)
-        
-        # Add text
+
+        tile_height = total_height + 3 * padding
+        tile_width = max_width + 2 * padding
+
+        tile = np.zeros((tile_height, tile_width, 3), dtype=np.uint8)
+        # The black backdrop blends at ~0.5 while the text is fully
+        # opaque. The mask is drawn at 8-bit depth - OpenCV's drawing
+        # routines require CV_8U images - and scaled to float32 after
+        alpha_mask = np.full((tile_height, tile_width), 128, dtype=np.uint8)
+
+        x = padding
+        y_bottom = tile_height - padding
         y_main = y_bottom - user_height - time_height - 2 * line_spacing
         y_time = y_bottom - user_height - line_spacing
         y_user = y_bottom
-        
-        # Draw text
-        cv2.putText(
-            output, main_text, (x, y_main),
-            font, main_font_scale, color, main_thickness, cv2.LINE_AA
-        )
-        cv2.putText(
-            output, timestamp_text, (x, y_time),
-            font, info_font_scale, color, info_thickness, cv2.LINE_AA
-        )
-        cv2.putText(
-            output, user_text, (x, y_user),
-            font, info_font_scale, color, info_thickness, cv2.LINE_AA
-        )
-        
-        return output
\ No newline at end of file
+
+        for text, y, scale, thickness in (
+            (main_text, y_main, main_font_scale, main_thickness),
+            (timestamp_text, y_time, info_font_scale, info_thickness),
+            (user_text, y_user, info_font_scale, info_thickness),
+        ):
+            cv2.putText(tile, text, (x, y), font, scale, color, thickness, cv2.LINE_AA)
+            cv2.putText(alpha_mask, text, (x, y), font, scale, 255, thickness, cv2.LINE_AA)
+
+        alpha = alpha_mask.astype(np.float32)[:, :, None] / 255.0
+        self._wm_premult = tile.astype(np.float32) * alpha
+        self._wm_inv_alpha = 1.0 - alpha
+        self._wm_margin = padding
+
+    def add_mansio_watermark(self, frame: np.ndarray) -> np.ndarray:
+        """Blend the Mansio watermark into the frame in place.
+
+        Only the small watermark ROI is touched; callers that still need
+        the clean frame afterwards must pass a copy they own.
+        """
+        tile_height, tile_width = self._wm_premult.shape[:2]
+        y0 = frame.shape[0] - tile_height
+        x1 = frame.shape[1] - self._wm_margin
+        x0 = x1 - tile_width
+        if y0 < 0 or x0 < 0:
+            return frame  # Frame too small for the watermark
+
+        roi = frame[y0:, x0:x1]
+        roi[:] = (self._wm_premult + roi * self._wm_inv_alpha).astype(np.uint8)
+
+        return frame
\ No newline at end of file
@@ -1,17 +1,50 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Request
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List
+import aiofiles
+import asyncio
 import shutil
 import os
-from datetime import datetime
-import uuid
+import time
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+import queue
+import hashlib
 import logging
+import logging.handlers
+from contextlib import asynccontextmanager, suppress
 from Image_Enhancement.Image import ImageProcessor
-from Video_enhancement.Video import VideoProcessor
+from video_enhancement.Video import VideoProcessor
 from Video_stitch.Video import VideoStitcher
 
-app = FastAPI(title="Mansio API for Media Processing")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Directory creation happens once per server start instead of at
+    # module import, which also keeps multi-process imports side-effect
+    # free
+    for media_type in DIRS.values():
+        for dir_path in media_type.values():
+            os.makedirs(dir_path, exist_ok=True)
+
+    # The worker pool lives for the lifetime of the application; each
+    # pool process builds its own processors lazily on first use
+    app.state.pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    try:
+        yield
+    finally:
+        app.state.pool.shutdown()
+        _log_listener.stop()  # flush queued log records
+
+
+# orjson serialises responses in C instead of stdlib json
+app = FastAPI(
+    title="Mansio API for Media Processing",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Configure CORS
 app.add_middleware(
@@ -25,7 +58,7 @@ app.add_middleware(
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Create necessary directories
+# Working directories, created at startup by the lifespan handler
 DIRS = {
     "image": {
         "upload": "static/uploads/images",
@@ -37,139 +70,456 @@ DIRS = {
     },
 }
 
-for media_type in DIRS.values():
-    for dir_path in media_type.values():
-        os.makedirs(dir_path, exist_ok=True)
+# Flat aliases for the request hot path - no per-request dict walks or
+# os.path.join calls to rebuild the same strings
+IMG_UPLOAD_DIR = DIRS["image"]["upload"]
+IMG_PROCESSED_DIR = DIRS["image"]["processed"]
+VID_UPLOAD_DIR = DIRS["video"]["upload"]
+VID_PROCESSED_DIR = DIRS["video"]["processed"]
 
 # Initialize processors with current timestamp and user
 CURRENT_USER = "bibhabasuiitkgp"
 CURRENT_TIMESTAMP = "2025-03-09 05:59:54"
 
-image_processor = ImageProcessor()
-video_processor = VideoProcessor()
-video_stitcher = VideoStitcher(user_login=CURRENT_USER)
+# Accepted upload extensions (lowercase, without the dot)
+_IMAGE_EXTS = frozenset({"png", "jpg", "jpeg", "tiff", "bmp"})
+_VIDEO_EXTS = frozenset({"mp4", "avi", "mov", "mkv"})
+
+
+def _file_ext(filename: str) -> str:
+    """Lowercased extension without the dot, or '' if there is none."""
+    dot = filename.rfind(".")
+    return filename[dot + 1:].lower() if dot != -1 else ""
+
+
+def _partial_path(path: str) -> str:
+    """In-progress path alongside `path`, keeping the extension.
+
+    The extension stays last because OpenCV picks the container/codec
+    from the suffix; `.part` is inserted before it.
+    """
+    root, dot, ext = path.rpartition(".")
+    return f"{root}.part.{ext}" if dot else f"{path}.part"
+
+
+def _publish_output(part_path: str, output_path: str, success: bool) -> None:
+    """Atomically publish a finished output, or drop the partial file.
+
+    The static mount only ever sees fully-written files this way; a
+    client can never fetch a half-encoded result.
+    """
+    if success:
+        os.replace(part_path, output_path)
+    else:
+        with suppress(FileNotFoundError):
+            os.remove(part_path)
+
+
+# Per-process processors for the worker pool. The OpenCV objects they
+# hold are not picklable, so each pool process builds its own lazily.
+_worker_image_processor = None
+_worker_video_processor = None
+_worker_video_stitcher = None
+
+
+def _enhance_image_in_worker(input_path: str, output_path: str):
+    global _worker_image_processor
+    if _worker_image_processor is None:
+        _worker_image_processor = ImageProcessor()
+    part_path = _partial_path(output_path)
+    success, message = _worker_image_processor.adjust_brightness(input_path, part_path)
+    _publish_output(part_path, output_path, success)
+    return success, message
+
+
+def _enhance_video_in_worker(input_path: str, output_path: str):
+    global _worker_video_processor
+    if _worker_video_processor is None:
+        _worker_video_processor = VideoProcessor()
+    try:
+        part_path = _partial_path(output_path)
+        success, message = _worker_video_processor.adjust_video_brightness(
+            input_path, part_path, max_workers=4
+        )
+        _publish_output(part_path, output_path, success)
+        return success, message
+    finally:
+        # The upload is no longer needed once processing has finished
+        with suppress(FileNotFoundError):
+            os.remove(input_path)
+
+
+def _stitch_videos_in_worker(video_paths: List[str], output_path: str):
+    global _worker_video_stitcher
+    if _worker_video_stitcher is None:
+        _worker_video_stitcher = VideoStitcher(user_login=CURRENT_USER)
+    part_path = _partial_path(output_path)
+    success, message = _worker_video_stitcher.process_videos(video_paths, part_path)
+    _publish_output(part_path, output_path, success)
+    return success, message
+
 
-# Setup logging
+# In-flight and finished video jobs, keyed by job id. Entries hold the
+# pool future, the hash-keyed output path and the URL the result will be
+# served from.
+JOBS = {}
+
+# In-flight image enhancements keyed by output path, so concurrent
+# identical uploads share one encode instead of racing two writers on
+# the same .part file
+_IMAGE_JOBS = {}
+
+# Cap on video jobs queued or running at once. Beyond this the endpoint
+# sheds load instead of accepting uploads it cannot process soon.
+MAX_PENDING_JOBS = 8
+
+# Finished jobs are kept so clients can still poll their result, but the
+# registry is capped: past this size the oldest finished entries go.
+MAX_FINISHED_JOBS = 256
+
+
+def _pending_job_count() -> int:
+    return sum(1 for job in JOBS.values() if not job["future"].done())
+
+
+def _evict_finished_jobs() -> None:
+    """Drop the oldest finished jobs once the registry exceeds its cap.
+
+    Dict order is insertion order, so iterating from the front evicts
+    the longest-completed entries first; pending jobs are never dropped.
+    """
+    if len(JOBS) <= MAX_FINISHED_JOBS:
+        return
+    for job_id in [jid for jid, job in JOBS.items() if job["future"].done()]:
+        del JOBS[job_id]
+        if len(JOBS) <= MAX_FINISHED_JOBS:
+            return
+
+# Setup logging. Emission is an O(1) queue put; the stream and file
+# handlers run on the QueueListener's thread, so a log call inside an
+# async handler never blocks the event loop on disk I/O
+_log_queue = queue.Queue(-1)
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("media_processing.log"),
-    ],
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
 )
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.StreamHandler(),
+    logging.FileHandler("media_processing.log"),
+)
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
+# Chunk size for streaming uploads to disk. 1 MiB keeps the read/write
+# syscall count low for multi-hundred-MB video uploads
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Hard ceiling on upload size; oversize requests fail with 413 before
+# their body is written to disk
+MAX_UPLOAD_BYTES = 2 << 30  # 2 GiB
 
-@app.post("/enhance/image/")
+
+def _unique_suffix() -> str:
+    """Cheap unique name fragment: wall-clock ns plus 8 random hex chars.
+
+    time_ns costs ~80 ns and token_hex is a single urandom read, against
+    a full UUID object construction plus dashed-repr formatting.
+    """
+    return f"{time.time_ns():x}_{secrets.token_hex(4)}"
+
+
+async def check_upload_size(request: Request) -> None:
+    """Reject oversize uploads from Content-Length before reading the body."""
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Upload too large")
+
+
+def _sendfile_upload(in_fd: int, dest_path: str) -> str:
+    """Copy an on-disk upload to dest_path entirely in kernel space.
+
+    Returns the SHA-256 hex digest of the copied bytes, read back from
+    the still-warm page cache since sendfile never surfaces them here.
+    """
+    out_fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        offset = 0
+        while True:
+            sent = os.sendfile(out_fd, in_fd, offset, UPLOAD_CHUNK_SIZE)
+            if sent == 0:
+                break
+            offset += sent
+            if offset > MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="Upload too large")
+    finally:
+        os.close(out_fd)
+
+    digest = hashlib.sha256()
+    with open(dest_path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def save_upload(file: UploadFile, dest_path: str) -> str:
+    """Stream an uploaded file to disk without blocking the event loop.
+
+    Large uploads spill from Starlette's spooled buffer to a real temp
+    file; for those the bytes are already on disk, so os.sendfile copies
+    them without bouncing each chunk through userspace. Small in-memory
+    uploads (and platforms without sendfile) take the buffered async path.
+
+    Returns the SHA-256 hex digest of the content, computed alongside the
+    copy, so callers can dedup identical uploads.
+    """
+    spooled = file.file
+    if hasattr(os, "sendfile") and getattr(spooled, "_rolled", False):
+        try:
+            return await asyncio.to_thread(
+                _sendfile_upload, spooled.fileno(), dest_path
+            )
+        except OSError as e:
+            logger.warning(f"sendfile upload copy failed, using buffered copy: {e}")
+            await file.seek(0)
+        except HTTPException:
+            with suppress(FileNotFoundError):
+                os.remove(dest_path)
+            raise
+
+    digest = hashlib.sha256()
+    total = 0
+    try:
+        async with aiofiles.open(dest_path, "wb") as out_file:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                # Belt and braces over the Content-Length gate: chunked
+                # or lying clients get cut off as soon as they exceed it
+                total += len(chunk)
+                if total > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+                digest.update(chunk)
+                await out_file.write(chunk)
+    except HTTPException:
+        with suppress(FileNotFoundError):
+            os.remove(dest_path)
+        raise
+    return digest.hexdigest()
+
+
+@app.post("/enhance/image/", dependencies=[Depends(check_upload_size)])
 async def enhance_image(file: UploadFile = File(...)):
     """
     Upload and enhance a single image
     Returns the URL of the enhanced image
     """
     try:
-        # Validate file format
-        if not file.filename.lower().endswith(
-            (".png", ".jpg", ".jpeg", ".tiff", ".bmp")
-        ):
+        # Validate file format: O(1) set lookup on just the extension
+        file_extension = _file_ext(file.filename)
+        if file_extension not in _IMAGE_EXTS:
             raise HTTPException(status_code=400, detail="Invalid image format")
 
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{str(uuid.uuid4())}{file_extension}"
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # The upload lands under a throwaway unique name; outputs are
+        # keyed by content hash so identical uploads share one result
+        input_path = f"{IMG_UPLOAD_DIR}/input_{_unique_suffix()}.{file_extension}"
 
-        # Set up input and output paths
-        input_path = os.path.join(DIRS["image"]["upload"], f"input_{unique_filename}")
-        output_path = os.path.join(
-            DIRS["image"]["processed"], f"enhanced_{timestamp}_{unique_filename}"
-        )
+        # Save uploaded file, hashing it as it streams
+        content_hash = await save_upload(file, input_path)
 
-        # Save uploaded file
-        with open(input_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        output_filename = f"enhanced_{content_hash}.{file_extension}"
+        output_path = f"{IMG_PROCESSED_DIR}/{output_filename}"
 
-        # Process the image
-        success, message = image_processor.adjust_brightness(input_path, output_path)
+        # Re-uploading identical content reuses the existing result
+        if os.path.exists(output_path):
+            with suppress(FileNotFoundError):
+                os.remove(input_path)
+            return {
+                "status": "success",
+                "message": "Image already enhanced",
+                "enhanced_image_url": f"/static/processed/images/{output_filename}",
+            }
 
-        # Clean up input file
-        if os.path.exists(input_path):
-            os.remove(input_path)
+        # Process the image in the worker pool so concurrent requests
+        # use separate cores instead of contending for the GIL. If a
+        # concurrent identical upload is already enhancing to this
+        # output, await its future instead of starting a duplicate
+        job = _IMAGE_JOBS.get(output_path)
+        owner = job is None
+        if owner:
+            job = asyncio.get_running_loop().run_in_executor(
+                app.state.pool, _enhance_image_in_worker, input_path, output_path
+            )
+            _IMAGE_JOBS[output_path] = job
+
+        try:
+            success, message = await job
+        finally:
+            if owner:
+                _IMAGE_JOBS.pop(output_path, None)
+            # Clean up input file (each request saved its own copy)
+            with suppress(FileNotFoundError):
+                os.remove(input_path)
 
         if success:
             return {
                 "status": "success",
                 "message": message,
-                "enhanced_image_url": f"/static/processed/images/enhanced_{timestamp}_{unique_filename}",
+                "enhanced_image_url": f"/static/processed/images/{output_filename}",
             }
         else:
             raise HTTPException(status_code=500, detail=message)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing image: {str(e)}")
         # Clean up files in case of error
-        if "input_path" in locals() and os.path.exists(input_path):
-            os.remove(input_path)
-        if "output_path" in locals() and os.path.exists(output_path):
-            os.remove(output_path)
+        if "input_path" in locals():
+            with suppress(FileNotFoundError):
+                os.remove(input_path)
+        if "output_path" in locals():
+            with suppress(FileNotFoundError):
+                os.remove(output_path)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/enhance/video/")
+@app.post("/enhance/video/", dependencies=[Depends(check_upload_size)])
 async def enhance_video(file: UploadFile = File(...)):
     """
-    Upload and enhance a video
-    Returns the URL of the enhanced video
+    Upload a video for enhancement
+    Returns a job id; poll /jobs/{job_id} for the result
     """
+    if _pending_job_count() >= MAX_PENDING_JOBS:
+        raise HTTPException(
+            status_code=503, detail="Too many jobs in progress, retry later"
+        )
+
     try:
-        # Validate file format
-        if not file.filename.lower().endswith((".mp4", ".avi", ".mov", ".mkv")):
+        # Validate file format: O(1) set lookup on just the extension
+        file_extension = _file_ext(file.filename)
+        if file_extension not in _VIDEO_EXTS:
             raise HTTPException(status_code=400, detail="Invalid video format")
 
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{str(uuid.uuid4())}{file_extension}"
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # The upload lands under a throwaway unique name; outputs are
+        # keyed by content hash so identical uploads share one result
+        input_path = f"{VID_UPLOAD_DIR}/input_{_unique_suffix()}.{file_extension}"
 
-        # Set up input and output paths
-        input_path = os.path.join(DIRS["video"]["upload"], f"input_{unique_filename}")
-        output_path = os.path.join(
-            DIRS["video"]["processed"], f"enhanced_{timestamp}_{unique_filename}"
-        )
-
-        # Save uploaded file
-        with open(input_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Save uploaded file, hashing it as it streams
+        content_hash = await save_upload(file, input_path)
 
-        # Process the video
-        success, message = video_processor.adjust_video_brightness(
-            input_path, output_path, max_workers=4
-        )
+        output_filename = f"enhanced_{content_hash}.{file_extension}"
+        output_path = f"{VID_PROCESSED_DIR}/{output_filename}"
+        video_url = f"/video/{output_filename}"
 
-        # Clean up input file
-        if os.path.exists(input_path):
-            os.remove(input_path)
-
-        if success:
+        # Re-uploading identical content skips the re-encode entirely
+        if os.path.exists(output_path):
+            with suppress(FileNotFoundError):
+                os.remove(input_path)
             return {
                 "status": "success",
-                "message": "Video enhanced successfully",
-                "enhanced_video_url": f"/static/processed/videos/enhanced_{timestamp}_{unique_filename}",
+                "message": "Video already enhanced",
+                "enhanced_video_url": video_url,
             }
-        else:
-            raise HTTPException(status_code=500, detail=message)
 
+        # A concurrent identical upload may already be encoding to this
+        # output; point the client at that job rather than racing a
+        # second writer on the same .part file
+        for existing_id, job in JOBS.items():
+            if job["output_path"] == output_path and not job["future"].done():
+                with suppress(FileNotFoundError):
+                    os.remove(input_path)
+                return ORJSONResponse(
+                    status_code=202,
+                    content={
+                        "status": "processing",
+                        "job_id": existing_id,
+                        "status_url": f"/jobs/{existing_id}",
+                    },
+                    headers={"Location": f"/jobs/{existing_id}"},
+                )
+
+        # Queue processing on the worker pool and hand the client a job id
+        # instead of holding the connection open for the whole encode
+        _evict_finished_jobs()
+        job_id = secrets.token_hex(16)
+        JOBS[job_id] = {
+            "future": app.state.pool.submit(
+                _enhance_video_in_worker, input_path, output_path
+            ),
+            "output_path": output_path,
+            "video_url": video_url,
+        }
+
+        # 202 Accepted with a Location header is the standard shape for
+        # "queued, poll here" - clients and proxies understand it without
+        # parsing the body
+        return ORJSONResponse(
+            status_code=202,
+            content={
+                "status": "processing",
+                "job_id": job_id,
+                "status_url": f"/jobs/{job_id}",
+            },
+            headers={"Location": f"/jobs/{job_id}"},
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing video: {str(e)}")
         # Clean up files in case of error
-        if "input_path" in locals() and os.path.exists(input_path):
-            os.remove(input_path)
-        if "output_path" in locals() and os.path.exists(output_path):
-            os.remove(output_path)
+        if "input_path" in locals():
+            with suppress(FileNotFoundError):
+                os.remove(input_path)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/stitch/videos/")
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    Poll the status of a video enhancement job
+    """
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+
+    future = job["future"]
+    if not future.done():
+        return {"status": "processing"}
+
+    try:
+        success, message = future.result()
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+    if success:
+        return {
+            "status": "success",
+            "message": message,
+            "enhanced_video_url": job["video_url"],
+        }
+    return {"status": "error", "message": message}
+
+
+@app.get("/video/{name}")
+async def get_video(name: str):
+    """
+    Serve a processed video
+    FileResponse streams via sendfile and honours Range requests, which
+    the StaticFiles read/write loop does not do as efficiently for
+    multi-hundred-MB files
+    """
+    if name != os.path.basename(name):
+        raise HTTPException(status_code=400, detail="Invalid video name")
+
+    path = f"{VID_PROCESSED_DIR}/{name}"
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    return FileResponse(path, media_type="video/mp4")
+
+
+@app.post("/stitch/videos/", dependencies=[Depends(check_upload_size)])
 async def stitch_videos(files: List[UploadFile] = File(...)):
     """
     Upload multiple videos and stitch them together with Mansio watermark
@@ -178,14 +528,14 @@ async def stitch_videos(files: List[UploadFile] = File(...)):
     try:
         # Validate files
         for file in files:
-            if not file.filename.lower().endswith((".mp4", ".avi", ".mov", ".mkv")):
+            if _file_ext(file.filename) not in _VIDEO_EXTS:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Invalid video format for file: {file.filename}",
                 )
 
         # Create temporary directory for uploaded files
-        temp_dir = os.path.join(DIRS["video"]["upload"], str(uuid.uuid4()))
+        temp_dir = f"{VID_UPLOAD_DIR}/{_unique_suffix()}"
         os.makedirs(temp_dir, exist_ok=True)
 
         try:
@@ -193,27 +543,26 @@ async def stitch_videos(files: List[UploadFile] = File(...)):
             video_paths = []
             for file in files:
                 temp_path = os.path.join(temp_dir, file.filename)
-                with open(temp_path, "wb") as buffer:
-                    shutil.copyfileobj(file.file, buffer)
+                await save_upload(file, temp_path)
                 video_paths.append(temp_path)
 
             # Sort videos by filename
             video_paths.sort()
 
             # Generate output filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            output_filename = f"mansio_stitched_{timestamp}_{unique_id}.mp4"
-            output_path = os.path.join(DIRS["video"]["processed"], output_filename)
+            output_filename = f"mansio_stitched_{_unique_suffix()}.mp4"
+            output_path = f"{VID_PROCESSED_DIR}/{output_filename}"
 
-            # Stitch videos
-            success, message = video_stitcher.process_videos(video_paths, output_path)
+            # Stitch videos in the worker pool
+            success, message = await asyncio.get_running_loop().run_in_executor(
+                app.state.pool, _stitch_videos_in_worker, video_paths, output_path
+            )
 
             if success:
                 return {
                     "status": "success",
                     "message": message,
-                    "stitched_video_url": f"/static/processed/videos/{output_filename}",
+                    "stitched_video_url": f"/video/{output_filename}",
                     "watermark_info": {
                         "user": CURRENT_USER,
                         "timestamp": CURRENT_TIMESTAMP,
@@ -224,18 +573,24 @@ async def stitch_videos(files: List[UploadFile] = File(...)):
                 raise HTTPException(status_code=500, detail=message)
 
         finally:
-            # Clean up temporary files
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            # Clean up temporary files off the event loop - the tree can
+            # hold several full-size uploads
+            await asyncio.to_thread(shutil.rmtree, temp_dir, True)
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in video stitching: {str(e)}")
-        if "output_path" in locals() and os.path.exists(output_path):
-            os.remove(output_path)
+        if "output_path" in locals():
+            with suppress(FileNotFoundError):
+                os.remove(output_path)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Keep connections alive past typical job-polling intervals so
+    # clients reuse one TCP connection instead of re-handshaking per
+    # request; CPU work scales through the worker pool, not web workers
+    uvicorn.run(app, host="0.0.0.0", port=8000, timeout_keep_alive=75)
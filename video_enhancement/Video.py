@@ -2,25 +2,80 @@ import numpy as np
 import cv2
 from typing import Tuple
 import os
+import threading
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
 from tqdm import tqdm
 from Image_Enhancement.Image import ImageProcessor
 
 class VideoProcessor(ImageProcessor):
-    def __init__(self, debug_mode: bool = False):
+    SMOOTHING_WINDOW = 5  # Brightness samples averaged for the fine-tune
+
+    def __init__(self, debug_mode: bool = False, use_gpu: bool = False):
         """
         Initialize the video processing system.
-        Inherits from ImageProcessor for frame-by-frame processing.
+        Inherits from ImageProcessor for frame-by-frame processing, so
+        use_gpu routes the per-frame CLAHE through cv2.cuda when a CUDA
+        device is available.
         """
-        super().__init__(debug_mode)
+        super().__init__(debug_mode, use_gpu=use_gpu)
         self.processing_status = {}
 
-    def get_video_info(self, video_path: str) -> Tuple[int, int, int, float]:
+        # Watermark overlays rendered once per resolution and reused
+        self._watermark_cache = {}
+
+        # Ring buffer of recent brightness samples with a running sum,
+        # so each smoothing update is O(1); the lock keeps it consistent
+        # when chunks are enhanced on worker threads
+        self._brightness_window = deque(maxlen=self.SMOOTHING_WINDOW)
+        self._brightness_sum = 0.0
+        self._smooth_lock = threading.Lock()
+
+    def _open_capture(self, video_path: str) -> cv2.VideoCapture:
+        """Open a capture, asking FFmpeg for hardware decode when supported.
+
+        Newer OpenCV builds accept a hardware-acceleration hint (NVDEC,
+        VAAPI, VideoToolbox, ...); if the accelerated capture fails to
+        open, fall back to the default software decoder.
         """
-        Get video metadata.
+        if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+            cap = cv2.VideoCapture(
+                video_path,
+                cv2.CAP_FFMPEG,
+                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+            )
+            if cap.isOpened():
+                return cap
+        return cv2.VideoCapture(video_path)
+
+    def _open_writer(
+        self, output_path: str, fps: float, size: Tuple[int, int]
+    ) -> cv2.VideoWriter:
+        """Open the output writer, preferring hardware-accelerated H.264.
+
+        Falls back to the software mp4v writer when the accelerated one
+        cannot be opened.
+        """
+        if hasattr(cv2, "VIDEOWRITER_PROP_HW_ACCELERATION"):
+            out = cv2.VideoWriter(
+                output_path,
+                cv2.CAP_FFMPEG,
+                cv2.VideoWriter_fourcc(*"avc1"),
+                fps,
+                size,
+                [cv2.VIDEOWRITER_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+            )
+            if out.isOpened():
+                return out
+
+        return cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+
+    def get_video_info(self, cap: cv2.VideoCapture) -> Tuple[int, int, int, float]:
+        """
+        Get video metadata from an already-open capture.
         """
         try:
-            cap = cv2.VideoCapture(video_path)
             if not cap.isOpened():
                 raise ValueError("Failed to open video file")
 
@@ -28,206 +83,295 @@ class VideoProcessor(ImageProcessor):
             width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             fps = cap.get(cv2.CAP_PROP_FPS)
-            
-            cap.release()
+
             return frame_count, width, height, fps
         except Exception as e:
             self.logger.error(f"Error getting video info: {str(e)}")
             raise
 
-    def add_watermark(self, frame: np.ndarray) -> np.ndarray:
+    def _build_watermark_overlay(self, height: int, width: int):
         """
-        Add Mansio watermark with timestamp and user info to a frame.
-        Creates a professional-looking overlay with proper formatting and positioning.
+        Render the watermark tile for a resolution and cache it.
+
+        Nothing in the watermark depends on frame content - only on the
+        resolution (through the font scaling) - so the backdrop, text and
+        border are rasterised once into a small tile plus alpha mask.
         """
-        try:
-            height, width = frame.shape[:2]
-            
-            # Fixed timestamp and user info
-            timestamp = "2025-03-09 21:51:48"  # Use the fixed timestamp
-            user = "bibhabasuiitkgp"
-            
-            # Create a more structured watermark with proper spacing
-            watermark_text = [
-                "MANSIO",  # Brand name in caps
-                f"Processed: {timestamp} UTC",  # Timestamp
-                f"User: {user}"  # User info
-            ]
-            
-            # Text settings
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            base_font_scale = min(width, height) / 1500.0
-            
-            # Different sizes for different lines
-            font_scales = [
-                base_font_scale * 1.2,  # Larger for brand name
-                base_font_scale * 0.9,  # Smaller for timestamp
-                base_font_scale * 0.9   # Smaller for user info
-            ]
-            
-            # Calculate total height and maximum width
-            total_height = 0
-            max_width = 0
-            text_sizes = []
-            
-            for text, scale in zip(watermark_text, font_scales):
-                thickness = max(1, int(scale * 2))
-                (text_width, text_height), baseline = cv2.getTextSize(
-                    text, font, scale, thickness
-                )
-                text_sizes.append((text_width, text_height, thickness, baseline))
-                total_height += text_height + baseline + 5  # 5 pixels spacing
-                max_width = max(max_width, text_width)
-
-            # Position the watermark block
-            padding = 20
-            margin = 10
-            block_width = max_width + 2 * padding
-            block_height = total_height + 2 * padding
-            
-            # Create position for the entire block (bottom-right corner)
-            block_x = width - block_width - margin
-            block_y = height - margin - block_height
-
-            # Create semi-transparent background
-            overlay = frame.copy()
-            cv2.rectangle(
-                overlay,
-                (block_x, block_y),
-                (block_x + block_width, block_y + block_height),
-                (0, 0, 0),
-                -1
+        # Fixed timestamp and user info
+        timestamp = "2025-03-09 21:51:48"  # Use the fixed timestamp
+        user = "bibhabasuiitkgp"
+
+        # Create a more structured watermark with proper spacing
+        watermark_text = [
+            "MANSIO",  # Brand name in caps
+            f"Processed: {timestamp} UTC",  # Timestamp
+            f"User: {user}"  # User info
+        ]
+
+        # Text settings
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        base_font_scale = min(width, height) / 1500.0
+
+        # Different sizes for different lines
+        font_scales = [
+            base_font_scale * 1.2,  # Larger for brand name
+            base_font_scale * 0.9,  # Smaller for timestamp
+            base_font_scale * 0.9   # Smaller for user info
+        ]
+
+        # Calculate total height and maximum width
+        total_height = 0
+        max_width = 0
+        text_sizes = []
+
+        for text, scale in zip(watermark_text, font_scales):
+            thickness = max(1, int(scale * 2))
+            (text_width, text_height), baseline = cv2.getTextSize(
+                text, font, scale, thickness
             )
-            
-            # Apply the overlay with transparency
-            alpha = 0.7
-            frame = cv2.addWeighted(overlay, 1-alpha, frame, alpha, 0)
-
-            # Add text lines
-            current_y = block_y + padding
-            for i, (text, font_scale) in enumerate(zip(watermark_text, font_scales)):
-                text_width, text_height, thickness, baseline = text_sizes[i]
-                
-                # Center text horizontally in the block
-                text_x = block_x + (block_width - text_width) // 2
-                
-                # Add text with white color
+            text_sizes.append((text_width, text_height, thickness, baseline))
+            total_height += text_height + baseline + 5  # 5 pixels spacing
+            max_width = max(max_width, text_width)
+
+        # Position the watermark block
+        padding = 20
+        margin = 10
+        block_width = max_width + 2 * padding
+        block_height = total_height + 2 * padding
+
+        # Create position for the entire block (bottom-right corner)
+        block_x = width - block_width - margin
+        block_y = height - margin - block_height
+
+        tile = np.zeros((block_height, block_width, 3), dtype=np.uint8)
+        # The black backdrop blends at ~0.3 while text and border are
+        # opaque. The mask is drawn at 8-bit depth - OpenCV's drawing
+        # routines require CV_8U images - and scaled to float32 after
+        alpha_mask = np.full((block_height, block_width), 77, dtype=np.uint8)
+
+        # Add text lines
+        current_y = padding
+        for i, (text, font_scale) in enumerate(zip(watermark_text, font_scales)):
+            text_width, text_height, thickness, baseline = text_sizes[i]
+
+            # Center text horizontally in the block
+            text_x = (block_width - text_width) // 2
+
+            for target, colour in ((tile, (255, 255, 255)), (alpha_mask, 255)):
                 cv2.putText(
-                    frame,
+                    target,
                     text,
                     (text_x, current_y + text_height),
                     font,
                     font_scale,
-                    (255, 255, 255),  # White color
+                    colour,
                     thickness,
                     cv2.LINE_AA
                 )
-                
-                current_y += text_height + baseline + 5
 
-            # Add a subtle border around the block
+            current_y += text_height + baseline + 5
+
+        # Add a subtle border around the block
+        for target, colour in ((tile, (255, 255, 255)), (alpha_mask, 255)):
             cv2.rectangle(
-                frame,
-                (block_x, block_y),
-                (block_x + block_width, block_y + block_height),
-                (255, 255, 255),  # White border
+                target,
+                (0, 0),
+                (block_width - 1, block_height - 1),
+                colour,
                 1,  # Thickness
                 cv2.LINE_AA
             )
-            
+
+        alpha = alpha_mask.astype(np.float32)[:, :, None] / 255.0
+        overlay = (
+            tile.astype(np.float32) * alpha,  # premultiplied tile
+            1.0 - alpha,
+            block_x,
+            block_y,
+            block_width,
+            block_height,
+        )
+        self._watermark_cache[(height, width)] = overlay
+        return overlay
+
+    def add_watermark(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Add Mansio watermark with timestamp and user info to a frame.
+
+        The pre-rendered overlay for the frame's resolution is alpha-
+        blended into the bottom-right ROI in place, so the per-frame cost
+        is one small blend instead of full text rasterisation.
+        """
+        try:
+            height, width = frame.shape[:2]
+            overlay = self._watermark_cache.get((height, width))
+            if overlay is None:
+                overlay = self._build_watermark_overlay(height, width)
+
+            premult, inv_alpha, block_x, block_y, block_width, block_height = overlay
+            if block_x < 0 or block_y < 0:
+                return frame  # Frame too small for the watermark
+
+            roi = frame[block_y:block_y + block_height, block_x:block_x + block_width]
+            roi[:] = (premult + roi * inv_alpha).astype(np.uint8)
+
             return frame
-            
+
         except Exception as e:
             self.logger.error(f"Error adding watermark: {str(e)}")
             return frame
 
+    def _smoothed_fine_tune(self, corrected_l: np.ndarray):
+        """
+        Pick the brightness fine-tune from a running average of recent
+        chunk samples.
+
+        Averaging over the window stops the correction flickering when a
+        video's measured brightness straddles one of the thresholds.
+        """
+        avg_brightness, _, _ = self.analyze_exposure(corrected_l)
+
+        with self._smooth_lock:
+            if len(self._brightness_window) == self._brightness_window.maxlen:
+                self._brightness_sum -= self._brightness_window[0]
+            self._brightness_window.append(avg_brightness)
+            self._brightness_sum += avg_brightness
+
+            smoothed = self._brightness_sum / len(self._brightness_window)
+        if smoothed < 100:
+            return (1.2, 10)
+        if smoothed > 200:
+            return (0.8, -10)
+        return None
+
     def process_frame_chunk(self, frames: list, start_idx: int) -> list:
         """
         Process a chunk of frames in parallel.
+
+        Scene brightness drifts slowly between neighbouring frames, so the
+        brightness fine-tune is measured on the first frame of the chunk
+        and reused for the rest, dropping one analysis pass per frame.
         """
         processed_frames = []
+        fine_tune = None
         for i, frame in enumerate(frames):
             try:
-                processed_frame = self.correct_exposure(frame)
+                lab, corrected_l = self._correct_lab(frame)
+                if i == 0:
+                    fine_tune = self._smoothed_fine_tune(corrected_l)
+                processed_frame = self._finish_correction(lab, corrected_l, fine_tune)
                 processed_frame = self.add_watermark(processed_frame)
                 processed_frames.append(processed_frame)
-                
+
                 if self.debug_mode and i % 10 == 0:
-                    self.logger.info(f"Processed frame {start_idx + i}")
-                    
+                    self.logger.info("Processed frame %d", start_idx + i)
+
             except Exception as e:
                 self.logger.error(f"Error processing frame {start_idx + i}: {str(e)}")
                 processed_frames.append(frame)
-                
+
         return processed_frames
 
+    def _read_chunks(self, cap: cv2.VideoCapture, chunk_size: int, chunk_q: Queue) -> None:
+        """Decode stage: group frames into chunks and queue them."""
+        try:
+            frames_buffer = []
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                frames_buffer.append(frame)
+                if len(frames_buffer) >= chunk_size:
+                    chunk_q.put(frames_buffer)
+                    frames_buffer = []
+
+            if frames_buffer:
+                chunk_q.put(frames_buffer)
+        except Exception as e:
+            self.logger.error(f"Error reading video chunks: {str(e)}")
+        finally:
+            chunk_q.put(None)  # end of stream
+
     def adjust_video_brightness(
-        self, 
-        input_path: str, 
+        self,
+        input_path: str,
         output_path: str,
         max_workers: int = 4,
         chunk_size: int = 30
     ) -> Tuple[bool, str]:
         """
         Process a video file and save the enhanced version.
+
+        Decoding runs on its own thread feeding chunks through a bounded
+        queue, and up to max_workers chunks are enhanced concurrently on
+        the executor (OpenCV releases the GIL in its C++ loops). Results
+        are written back strictly in submission order.
         """
         try:
-            cap = cv2.VideoCapture(input_path)
+            cap = self._open_capture(input_path)
             if not cap.isOpened():
                 return False, "Failed to open input video"
 
-            frame_count, width, height, fps = self.get_video_info(input_path)
-            
+            frame_count, width, height, fps = self.get_video_info(cap)
+
+            # Smoothing state is per video
+            self._brightness_window.clear()
+            self._brightness_sum = 0.0
+
             # Ensure output directory exists
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(
-                output_path, 
-                fourcc, 
-                fps, 
-                (width, height)
+
+            out = self._open_writer(output_path, fps, (width, height))
+
+            # The GPU path shares one GpuMat, so keep it single-worker
+            workers = 1 if self.use_gpu else max_workers
+
+            chunk_q = Queue(maxsize=workers + 1)
+            reader = threading.Thread(
+                target=self._read_chunks, args=(cap, chunk_size, chunk_q), daemon=True
             )
+            reader.start()
 
-            frames_buffer = []
+            submitted_count = 0
             processed_count = 0
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            draining = False
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
                 with tqdm(total=frame_count, desc="Processing video") as pbar:
                     while True:
-                        ret, frame = cap.read()
-                        if not ret:
+                        # Keep up to `workers` chunks in flight
+                        while not draining and len(pending) < workers:
+                            frames_buffer = chunk_q.get()
+                            if frames_buffer is None:
+                                draining = True
+                                break
+                            pending.append((
+                                executor.submit(
+                                    self.process_frame_chunk,
+                                    frames_buffer,
+                                    submitted_count,
+                                ),
+                                len(frames_buffer),
+                            ))
+                            submitted_count += len(frames_buffer)
+
+                        if not pending:
                             break
 
-                        frames_buffer.append(frame)
-                        
-                        if len(frames_buffer) >= chunk_size:
-                            processed_frames = self.process_frame_chunk(
-                                frames_buffer, 
-                                processed_count
-                            )
-                            
-                            for processed_frame in processed_frames:
-                                out.write(processed_frame)
-                            
-                            processed_count += len(frames_buffer)
-                            pbar.update(len(frames_buffer))
-                            frames_buffer = []
-
-                    if frames_buffer:
-                        processed_frames = self.process_frame_chunk(
-                            frames_buffer, 
-                            processed_count
-                        )
-                        for processed_frame in processed_frames:
+                        # Drain the oldest chunk so output order is preserved
+                        future, chunk_len = pending.popleft()
+                        for processed_frame in future.result():
                             out.write(processed_frame)
-                        
-                        processed_count += len(frames_buffer)
-                        pbar.update(len(frames_buffer))
 
+                        processed_count += chunk_len
+                        pbar.update(chunk_len)
+
+            reader.join()
             cap.release()
             out.release()
-            
+
             return True, "Video enhanced successfully"
 
         except Exception as e: